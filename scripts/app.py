@@ -2,7 +2,11 @@ import streamlit as st
 import pandas as pd
 import joblib
 import os
+import sys
+import threading
+import time
 import plotly.express as px
+from tree_explain import build_path_tables, path_contributions
 
 
 # Initialize paths relative to script location
@@ -11,6 +15,7 @@ ROOT_DIR = os.path.dirname(BASE_DIR)
 
 model_path = os.path.join(ROOT_DIR, 'models', 'asian_cinema_model.joblib')
 features_path = os.path.join(ROOT_DIR, 'models', 'feature_cols.joblib')
+importance_path = os.path.join(ROOT_DIR, 'models', 'global_importance.joblib')
 csv_path = os.path.join(ROOT_DIR, 'data', 'asian_cinema_RECOVERED.csv')
 
 # Load regression model and selected feature columns
@@ -18,19 +23,115 @@ if not os.path.exists(model_path) or not os.path.exists(features_path):
     st.error("❌ Model files missing from /models!")
     st.stop()
 
-model = joblib.load(model_path)
-feature_cols = joblib.load(features_path)
-
 LANG_MAP = {
     'ja': 'Japanese', 'ko': 'Korean', 'zh': 'Chinese', 
     'th': 'Thai', 'vi': 'Vietnamese', 'en': 'English'
 }
 
-@st.cache_data
+@st.cache_resource
+def resource_stats():
+    """Process-wide call/load counters shared by every session."""
+    return {'lock': threading.Lock(), 'calls': {}, 'loads': {}, 'load_ms': {}}
+
+def record_load(name, start):
+    stats = resource_stats()
+    with stats['lock']:
+        stats['loads'][name] = stats['loads'].get(name, 0) + 1
+        stats['load_ms'][name] = (time.perf_counter() - start) * 1000
+
+def tracked(name, loader):
+    """Call a cached loader, counting the call so hits = calls - loads."""
+    stats = resource_stats()
+    with stats['lock']:
+        stats['calls'][name] = stats['calls'].get(name, 0) + 1
+    return loader()
+
+def process_rss_mb():
+    """(label, MB) for this process: current RSS from /proc, else the peak RSS high-water mark."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return "Process RSS", int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return "Process RSS", None
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return "Peak RSS", peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+# One shared copy per process (not per session or rerun); callers must treat it as read-only
+@st.cache_resource
+def load_model():
+    start = time.perf_counter()
+    loaded = (joblib.load(model_path), joblib.load(features_path))
+    record_load('model', start)
+    return loaded
+
+@st.cache_resource
 def load_data():
-    return pd.read_csv(csv_path) if os.path.exists(csv_path) else None
-
-df = load_data()
+    start = time.perf_counter()
+    data = pd.read_csv(csv_path) if os.path.exists(csv_path) else None
+    record_load('dataset', start)
+    return data
+
+@st.cache_resource
+def load_genre_stats():
+    start = time.perf_counter()
+    data = tracked('dataset', load_data)
+    stats = None
+    if data is not None:
+        df_exploded = data.assign(genres=data['genres'].str.split(', ')).explode('genres')
+        stats = df_exploded.groupby('genres')['lb_rating'].mean().sort_values(ascending=False).head(10).reset_index()
+    record_load('genre_stats', start)
+    return stats
+
+@st.cache_resource
+def load_path_tables():
+    start = time.perf_counter()
+    tables = build_path_tables(tracked('model', load_model)[0])
+    record_load('path_tables', start)
+    return tables
+
+@st.cache_resource
+def load_global_importance():
+    start = time.perf_counter()
+    table = joblib.load(importance_path) if os.path.exists(importance_path) else None
+    record_load('global_importance', start)
+    return table
+
+def build_input(year, runtime, genre, lang_col, feature_cols):
+    # Zero-init input frame with fixed popularity baseline
+    input_df = pd.DataFrame(0, index=[0], columns=feature_cols)
+    input_df['year'] = year
+    input_df['runtime_min'] = runtime
+    input_df['tmdb_popularity'] = 50.0
+
+    if genre in input_df.columns: input_df[genre] = 1
+    if lang_col in input_df.columns: input_df[lang_col] = 1
+    return input_df
+
+def feature_group(col):
+    if col == 'year': return 'Release Year'
+    if col == 'runtime_min': return 'Runtime'
+    if col.startswith('lang_'): return 'Language'
+    if col in ['tmdb_popularity', 'budget', 'revenue']: return 'Fixed Inputs'
+    return 'Genre'
+
+@st.cache_data(max_entries=1024)
+def explain_prediction(year, runtime, genre, lang_col):
+    """Prediction plus grouped tree-path contributions, memoized per input tuple."""
+    model, feature_cols = tracked('model', load_model)
+    tables = tracked('path_tables', load_path_tables)
+    bias, contributions = path_contributions(model, tables, build_input(year, runtime, genre, lang_col, feature_cols))
+    grouped = pd.Series(contributions[0], index=feature_cols).groupby(feature_group).sum()
+    return bias + contributions[0].sum(), bias, grouped.sort_values(key=abs, ascending=False)
+
+model, feature_cols = tracked('model', load_model)
+df = tracked('dataset', load_data)
 
 # Interface Setup
 st.set_page_config(page_title="Asian Cinema AI", layout="wide", page_icon="🏮")
@@ -49,30 +150,49 @@ lang_options = {LANG_MAP.get(c.replace('lang_', ''), c.replace('lang_', '')): c
 selected_lang_name = st.sidebar.selectbox("Original Language", sorted(lang_options.keys()))
 selected_lang_col = lang_options[selected_lang_name]
 
+# Shared-resource health: cache hits, cold load times and process memory
+with st.sidebar.expander("🧠 Resource Report"):
+    stats = resource_stats()
+    with stats['lock']:
+        report = pd.DataFrame([
+            {
+                'Resource': name,
+                'Loads': stats['loads'].get(name, 0),
+                'Cache Hits': calls - stats['loads'].get(name, 0),
+                'Load Time (ms)': round(stats['load_ms'].get(name, 0.0), 1),
+            }
+            for name, calls in sorted(stats['calls'].items())
+        ])
+    st.dataframe(report, hide_index=True, use_container_width=True)
+    rss_label, rss = process_rss_mb()
+    st.metric(rss_label, f"{rss:.0f} MB" if rss is not None else "n/a")
+
 col1, col2 = st.columns([1, 1.2])
 
 with col1:
     st.subheader("🤖 AI Rating Guess")
     if st.button("Generate Prediction"):
-        # Zero-init input frame with fixed popularity baseline
-        input_df = pd.DataFrame(0, index=[0], columns=feature_cols)
-        input_df['year'] = year
-        input_df['runtime_min'] = runtime
-        input_df['tmdb_popularity'] = 50.0 
-        
-        if selected_genre in input_df.columns: input_df[selected_genre] = 1
-        if selected_lang_col in input_df.columns: input_df[selected_lang_col] = 1
-        
-        prediction = model.predict(input_df)[0]
+        prediction, baseline, contributions = explain_prediction(year, runtime, selected_genre, selected_lang_col)
         st.metric("Predicted Letterboxd Score", f"{prediction:.2f} ⭐")
         st.markdown(f"### Visual Rating: {'⭐' * int(round(prediction))}")
         st.progress(min(prediction/5.0, 1.0))
 
+        with st.expander("🔎 Explain this prediction"):
+            st.caption(f"Average film starts at {baseline:.2f} ⭐; each input pushes the score up or down.")
+            explain_df = contributions.rename('Contribution').reset_index().rename(columns={'index': 'Input'})
+            fig = px.bar(explain_df, x='Contribution', y='Input', orientation='h', color='Contribution',
+                         color_continuous_scale='RdYlGn', color_continuous_midpoint=0)
+            st.plotly_chart(fig, use_container_width=True)
+
+            importance = tracked('global_importance', load_global_importance)
+            if importance is not None:
+                st.markdown("**Overall feature importance (training set)**")
+                st.dataframe(importance.head(10), hide_index=True, use_container_width=True)
+
 with col2:
     st.subheader("📊 Genre Performance")
-    if df is not None:
-        df_exploded = df.assign(genres=df['genres'].str.split(', ')).explode('genres')
-        genre_stats = df_exploded.groupby('genres')['lb_rating'].mean().sort_values(ascending=False).head(10).reset_index()
+    genre_stats = tracked('genre_stats', load_genre_stats)
+    if genre_stats is not None:
         fig = px.bar(genre_stats, x='genres', y='lb_rating', color='lb_rating', 
                      color_continuous_scale='Viridis', labels={'genres': 'Genre', 'lb_rating': 'Avg Rating'})
         st.plotly_chart(fig, use_container_width=True)
@@ -3,6 +3,7 @@ import pandas as pd
 import time
 import re
 from letterboxdpy import movie as lb_movie
+from column_sketches import new_sketches, update_sketches, save_sketches, sketch_path
 
 # API Configuration
 API_KEY = "TMDB_API_KEY_REMOVED"
@@ -65,77 +66,99 @@ def get_letterboxd_rating(slug):
 
 # --- MAIN EXECUTION ---
 
-print("--- 🌏 Asian Cinema Data Collector 🌏 ---")
-print("Select the language scope:")
-print("1. Japanese (ja)")
-print("2. Korean (ko)")
-print("3. Chinese (zh)")
-print("4. Thai (th)")
-print("5. Combine All 4 (Top Asian Films)")
-
-choice = input("\nEnter number (1-5): ").strip()
-target = LANGUAGE_MAP.get(choice, LANGUAGE_MAP["1"]) # Default to Japanese if invalid
-
-print(f"\n🚀 Starting collection for {target['name']} films ({START_YEAR}-{END_YEAR})...")
-print(f"   Fetching Top {MOVIES_PER_YEAR} per year. This will take time.\n")
-
-all_movies = []
-total_requests = (END_YEAR - START_YEAR + 1) * MOVIES_PER_YEAR
-counter = 0
-
-for year in range(START_YEAR, END_YEAR + 1):
-    discover_url = f"{BASE_URL}/discover/movie"
-    params = {
-        "api_key": API_KEY,
-        "with_original_language": target['code'],
-        "primary_release_year": year,
-        "sort_by": "popularity.desc",
-        "page": 1
-    }
-    
-    # fetch slightly more than needed in case some are invalid
-    res = requests.get(discover_url, params=params).json()
-    candidates = res.get('results', [])[:MOVIES_PER_YEAR]
-    
-    print(f"📅 {year} | Processing {len(candidates)} films...", end="\r")
-    
-    for film in candidates:
-        details = get_full_tmdb_details(film['id'])
-        slug = clean_slug(film['title'])
-        lb_rating = get_letterboxd_rating(slug)
-        
-        row = {
-            "year": year,
-            "title": film['title'],
-            "original_title": film['original_title'],
-            "original_language": film['original_language'],
-            "lb_rating": lb_rating,
-            "tmdb_rating": film['vote_average'],
-            "tmdb_popularity": film['popularity'],
-            "vote_count": film['vote_count'],
-            "release_date": film['release_date'],
-            "overview": film['overview'],
-            **details
+def main():
+    # Imported here: refresh_ratings imports the scraper helpers from this module
+    from refresh_ratings import load_refresh_state, record_attempts, save_refresh_state
+
+    print("--- 🌏 Asian Cinema Data Collector 🌏 ---")
+    print("Select the language scope:")
+    print("1. Japanese (ja)")
+    print("2. Korean (ko)")
+    print("3. Chinese (zh)")
+    print("4. Thai (th)")
+    print("5. Combine All 4 (Top Asian Films)")
+
+    choice = input("\nEnter number (1-5): ").strip()
+    target = LANGUAGE_MAP.get(choice, LANGUAGE_MAP["1"]) # Default to Japanese if invalid
+
+    print(f"\n🚀 Starting collection for {target['name']} films ({START_YEAR}-{END_YEAR})...")
+    print(f"   Fetching Top {MOVIES_PER_YEAR} per year. This will take time.\n")
+
+    all_movies = []
+    attempts = []
+    sketches = new_sketches()
+    total_requests = (END_YEAR - START_YEAR + 1) * MOVIES_PER_YEAR
+    counter = 0
+
+    for year in range(START_YEAR, END_YEAR + 1):
+        discover_url = f"{BASE_URL}/discover/movie"
+        params = {
+            "api_key": API_KEY,
+            "with_original_language": target['code'],
+            "primary_release_year": year,
+            "sort_by": "popularity.desc",
+            "page": 1
         }
-        all_movies.append(row)
-        time.sleep(0.5)
-
-# --- SAVE TO CSV ---
-filename = f"asian_cinema_stats_{target['code'].replace('|','_')}.csv"
-df = pd.DataFrame(all_movies)
-
-# Reorder columns for logical reading
-cols = [
-    'year', 'title', 'lb_rating', 'tmdb_rating', 'genres', 'director', 
-    'runtime_min', 'budget', 'revenue', 'original_language', 
-    'production_companies', 'imdb_id', 'tmdb_id'
-]
-# Ensure we only use columns that actually exist (ignoring 'director' if not fetched above)
-available_cols = [c for c in cols if c in df.columns] 
-remaining_cols = [c for c in df.columns if c not in available_cols]
-df = df[available_cols + remaining_cols]
-
-df.to_csv(filename, index=False)
-
-print(f"\n\n✅ COMPLETED! Saved {len(df)} films to '{filename}'.")
-print(f"   You can import this directly into SQL or open in Excel.")
\ No newline at end of file
+
+        # fetch slightly more than needed in case some are invalid
+        res = requests.get(discover_url, params=params).json()
+        candidates = res.get('results', [])[:MOVIES_PER_YEAR]
+
+        print(f"📅 {year} | Processing {len(candidates)} films...", end="\r")
+
+        for film in candidates:
+            details = get_full_tmdb_details(film['id'])
+            slug = clean_slug(film['title'])
+            lb_rating = get_letterboxd_rating(slug)
+
+            row = {
+                "year": year,
+                "title": film['title'],
+                "original_title": film['original_title'],
+                "original_language": film['original_language'],
+                "lb_rating": lb_rating,
+                "tmdb_rating": film['vote_average'],
+                "tmdb_popularity": film['popularity'],
+                "vote_count": film['vote_count'],
+                "release_date": film['release_date'],
+                "overview": film['overview'],
+                **details
+            }
+            all_movies.append(row)
+            update_sketches(sketches, pd.DataFrame([row]))
+            attempts.append({
+                'tmdb_id': film['id'],
+                'fetched': lb_rating != "None",
+                'method': 'collected',
+                'attempted_at': pd.Timestamp.now(),
+            })
+            time.sleep(0.5)
+
+    # --- SAVE TO CSV ---
+    filename = f"asian_cinema_stats_{target['code'].replace('|','_')}.csv"
+    df = pd.DataFrame(all_movies)
+
+    # Reorder columns for logical reading
+    cols = [
+        'year', 'title', 'lb_rating', 'tmdb_rating', 'genres', 'director', 
+        'runtime_min', 'budget', 'revenue', 'original_language', 
+        'production_companies', 'imdb_id', 'tmdb_id'
+    ]
+    # Ensure we only use columns that actually exist (ignoring 'director' if not fetched above)
+    available_cols = [c for c in cols if c in df.columns] 
+    remaining_cols = [c for c in df.columns if c not in available_cols]
+    df = df[available_cols + remaining_cols]
+
+    df.to_csv(filename, index=False)
+    save_sketches(sketches, sketch_path(filename))
+
+    # Seed per-film last-fetched times for the rating refresh scheduler
+    if attempts:
+        save_refresh_state(record_attempts(load_refresh_state(), pd.DataFrame(attempts)))
+
+    print(f"\n\n✅ COMPLETED! Saved {len(df)} films to '{filename}'.")
+    print(f"   You can import this directly into SQL or open in Excel.")
+    print(f"   Column sketches saved to '{sketch_path(filename)}' for drift checks.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import argparse
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# Columns tracked per dataset version
+NUMERIC_COLUMNS = ['lb_rating', 'tmdb_popularity', 'runtime_min']
+CATEGORICAL_COLUMNS = ['genres', 'original_language']
+MULTI_VALUE_SEP = {'genres': ', '}
+
+# Log-bucket quantile sketch: every estimate is within 1% relative error,
+# and two sketches merge exactly by adding bucket counts
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+LOG_GAMMA = math.log(GAMMA)
+
+# Drift thresholds
+KS_THRESHOLD = 0.1
+NULL_RATE_THRESHOLD = 0.05
+TVD_THRESHOLD = 0.1
+
+
+def sketch_path(csv_path):
+    """Sketch file persisted next to its dataset version."""
+    return os.path.splitext(csv_path)[0] + '.sketch.json'
+
+def new_sketches():
+    return {
+        'rows': 0,
+        'numeric': {c: {'count': 0, 'nulls': 0, 'zeros': 0, 'positive': {}, 'negative': {}} for c in NUMERIC_COLUMNS},
+        'categorical': {c: {'count': 0, 'nulls': 0, 'counts': {}} for c in CATEGORICAL_COLUMNS},
+    }
+
+def load_sketches(path):
+    if not os.path.exists(path):
+        return new_sketches()
+    with open(path) as f:
+        return json.load(f)
+
+def save_sketches(sketches, path):
+    with open(path, 'w') as f:
+        json.dump(sketches, f, indent=1, sort_keys=True)
+
+def _add_counts(target, counts):
+    for key, n in counts.items():
+        key = str(key)
+        target[key] = target.get(key, 0) + int(n)
+
+def _bucket_counts(values):
+    keys = np.ceil(np.log(values) / LOG_GAMMA).astype(int)
+    return pd.Series(keys).value_counts().to_dict()
+
+def _bucket_value(key):
+    return 2 * GAMMA ** int(key) / (GAMMA + 1)
+
+def update_sketches(sketches, rows):
+    """Fold a batch of rows (DataFrame) into the sketches in place."""
+    sketches['rows'] += len(rows)
+
+    for col in NUMERIC_COLUMNS:
+        s = sketches['numeric'][col]
+        values = pd.to_numeric(rows[col], errors='coerce') if col in rows.columns else pd.Series(np.nan, index=rows.index)
+        valid = values.dropna().to_numpy(dtype=float)
+        s['count'] += len(values)
+        s['nulls'] += int(values.isnull().sum())
+        s['zeros'] += int((valid == 0).sum())
+        _add_counts(s['positive'], _bucket_counts(valid[valid > 0]))
+        _add_counts(s['negative'], _bucket_counts(-valid[valid < 0]))
+
+    for col in CATEGORICAL_COLUMNS:
+        s = sketches['categorical'][col]
+        values = rows[col] if col in rows.columns else pd.Series(np.nan, index=rows.index)
+        s['count'] += len(values)
+        s['nulls'] += int(values.isnull().sum())
+        values = values.dropna().astype(str)
+        if col in MULTI_VALUE_SEP:
+            values = values.str.split(MULTI_VALUE_SEP[col]).explode()
+        _add_counts(s['counts'], values.str.strip().value_counts().to_dict())
+
+    return sketches
+
+def merge_sketches(a, b):
+    """Combine two sketches into a new one, as if built from both batches."""
+    merged = new_sketches()
+    for sketches in (a, b):
+        merged['rows'] += sketches['rows']
+        for col, s in sketches['numeric'].items():
+            m = merged['numeric'].setdefault(col, {'count': 0, 'nulls': 0, 'zeros': 0, 'positive': {}, 'negative': {}})
+            for field in ('count', 'nulls', 'zeros'):
+                m[field] += s[field]
+            _add_counts(m['positive'], s['positive'])
+            _add_counts(m['negative'], s['negative'])
+        for col, s in sketches['categorical'].items():
+            m = merged['categorical'].setdefault(col, {'count': 0, 'nulls': 0, 'counts': {}})
+            m['count'] += s['count']
+            m['nulls'] += s['nulls']
+            _add_counts(m['counts'], s['counts'])
+    return merged
+
+def _distribution(s):
+    """Sorted (representative value, count) pairs for a numeric column sketch."""
+    points = [(-_bucket_value(k), n) for k, n in s['negative'].items()]
+    points += [(0.0, s['zeros'])] if s['zeros'] else []
+    points += [(_bucket_value(k), n) for k, n in s['positive'].items()]
+    return sorted(points)
+
+def quantile(s, q):
+    points = _distribution(s)
+    total = sum(n for _, n in points)
+    if total == 0:
+        return None
+    rank = q * (total - 1)
+    seen = 0
+    for value, n in points:
+        seen += n
+        if seen > rank:
+            return value
+    return points[-1][0]
+
+def ks_distance(a, b):
+    """Max CDF gap between two numeric sketches; buckets align since both share GAMMA."""
+    dist_a, dist_b = dict(_distribution(a)), dict(_distribution(b))
+    total_a, total_b = sum(dist_a.values()), sum(dist_b.values())
+    if total_a == 0 or total_b == 0:
+        return None
+    cdf_a = cdf_b = gap = 0.0
+    for value in sorted(set(dist_a) | set(dist_b)):
+        cdf_a += dist_a.get(value, 0) / total_a
+        cdf_b += dist_b.get(value, 0) / total_b
+        gap = max(gap, abs(cdf_a - cdf_b))
+    return gap
+
+def total_variation(a, b):
+    """Half the L1 distance between two normalized frequency tables."""
+    total_a, total_b = sum(a['counts'].values()), sum(b['counts'].values())
+    if total_a == 0 or total_b == 0:
+        return None
+    keys = set(a['counts']) | set(b['counts'])
+    return 0.5 * sum(abs(a['counts'].get(k, 0) / total_a - b['counts'].get(k, 0) / total_b) for k in keys)
+
+def null_rate(s):
+    return s['nulls'] / s['count'] if s['count'] else 0.0
+
+def drift_report(baseline, current):
+    """Compare two sketches column by column; no dataset rows are needed."""
+    rows = []
+    for col in NUMERIC_COLUMNS:
+        base, cur = baseline['numeric'].get(col), current['numeric'].get(col)
+        if base is None or cur is None:
+            continue
+        ks = ks_distance(base, cur)
+        null_shift = null_rate(cur) - null_rate(base)
+        rows.append({
+            'column': col,
+            'baseline_p10': quantile(base, 0.1), 'current_p10': quantile(cur, 0.1),
+            'baseline_p50': quantile(base, 0.5), 'current_p50': quantile(cur, 0.5),
+            'baseline_p90': quantile(base, 0.9), 'current_p90': quantile(cur, 0.9),
+            'null_rate_shift': null_shift,
+            'distance': ks,
+            'metric': 'ks',
+            'drift': (ks is not None and ks > KS_THRESHOLD) or abs(null_shift) > NULL_RATE_THRESHOLD,
+        })
+    for col in CATEGORICAL_COLUMNS:
+        base, cur = baseline['categorical'].get(col), current['categorical'].get(col)
+        if base is None or cur is None:
+            continue
+        tvd = total_variation(base, cur)
+        null_shift = null_rate(cur) - null_rate(base)
+        rows.append({
+            'column': col,
+            'null_rate_shift': null_shift,
+            'distance': tvd,
+            'metric': 'tvd',
+            'drift': (tvd is not None and tvd > TVD_THRESHOLD) or abs(null_shift) > NULL_RATE_THRESHOLD,
+        })
+    return pd.DataFrame(rows)
+
+def print_drift_report(baseline, current):
+    report = drift_report(baseline, current)
+    print(f"--- 📈 Drift Report ({baseline['rows']} baseline rows vs {current['rows']} current rows) ---")
+    for _, row in report.iterrows():
+        status = "❌" if row['drift'] else "✅"
+        distance = "n/a" if pd.isnull(row['distance']) else f"{row['distance']:.3f}"
+        line = f"{status} {row['column']}: {row['metric']}={distance}, null rate shift={row['null_rate_shift']:+.2%}"
+        if row['metric'] == 'ks' and pd.notnull(row['baseline_p50']) and pd.notnull(row['current_p50']):
+            line += f", median {row['baseline_p50']:.2f} → {row['current_p50']:.2f}"
+        print(line)
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Streaming column sketches and drift checks for collector batches.")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help="Build the sketch file for a dataset CSV")
+    build.add_argument('csv')
+
+    update = sub.add_parser('update', help="Sketch a new batch CSV, report drift against history, then merge it in")
+    update.add_argument('sketch')
+    update.add_argument('csv')
+
+    drift = sub.add_parser('drift', help="Compare two sketch files")
+    drift.add_argument('baseline')
+    drift.add_argument('current')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        sketches = update_sketches(new_sketches(), pd.read_csv(args.csv))
+        save_sketches(sketches, sketch_path(args.csv))
+        print(f"✅ Sketched {sketches['rows']} rows to {sketch_path(args.csv)}")
+    elif args.command == 'update':
+        # Check the incoming batch against history before folding it in
+        history = load_sketches(args.sketch)
+        batch = update_sketches(new_sketches(), pd.read_csv(args.csv))
+        save_sketches(batch, sketch_path(args.csv))
+        if history['rows']:
+            print_drift_report(history, batch)
+        sketches = merge_sketches(history, batch)
+        save_sketches(sketches, args.sketch)
+        print(f"✅ {args.sketch} now covers {sketches['rows']} rows")
+    else:
+        print_drift_report(load_sketches(args.baseline), load_sketches(args.current))
@@ -3,6 +3,7 @@ import joblib
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_absolute_error
+from tree_explain import build_path_tables, global_importance
 
 import os
 
@@ -36,9 +37,13 @@ model.fit(X_train, y_train)
 # Persist model and feature list for app usage
 model_path = os.path.join(ROOT_DIR, 'models', 'asian_cinema_model.joblib')
 features_path = os.path.join(ROOT_DIR, 'models', 'feature_cols.joblib')
+importance_path = os.path.join(ROOT_DIR, 'models', 'global_importance.joblib')
 
 joblib.dump(model, model_path)
 joblib.dump(feature_cols, features_path)
 
+# Global tree-path importance over the training split for the app's explain panel
+joblib.dump(global_importance(model, build_path_tables(model), X_train), importance_path)
+
 print(f"✅ Success! Model updated with {len(lang_dummies.columns)} languages.")
 print(f"New Error Rate: {mean_absolute_error(y_test, model.predict(X_test)):.4f}")
\ No newline at end of file
@@ -48,9 +48,22 @@ def main():
         print("❌ Required files missing.")
         return
 
+    # Imported here: refresh_ratings imports fetch_lb_rating from this module
+    from refresh_ratings import load_refresh_state, record_attempts, save_refresh_state
+
     df_audit = pd.read_csv(AUDIT_PATH)
     df_clean = pd.read_csv(CLEAN_PATH)
 
+    # Ratings the refresh scheduler fetched after the CLEAN snapshot are newer than CLEAN; keep them
+    state = load_refresh_state()
+    snapshot_time = pd.Timestamp.fromtimestamp(os.path.getmtime(CLEAN_PATH))
+    refreshed_ids = state.loc[pd.to_datetime(state['last_fetched']) > snapshot_time, 'tmdb_id']
+    refreshed = {}
+    if os.path.exists(OUTPUT_PATH) and len(refreshed_ids):
+        df_prev = pd.read_csv(OUTPUT_PATH)
+        df_prev = df_prev[df_prev['tmdb_id'].isin(refreshed_ids) & df_prev['lb_rating'].notnull()]
+        refreshed = df_prev.set_index('tmdb_id')['lb_rating'].to_dict()
+
     # Calculate genre-based medians as fallback for missing ratings
     print("📊 Calculating genre medians...")
     df_with_ratings = df_clean[df_clean['lb_rating'].notnull()].copy()
@@ -72,6 +85,9 @@ def main():
         decade = get_decade(year)
         
         print(f"[{i+1}/{total}] Processing: {title}")
+        if row['tmdb_id'] in refreshed:
+            print(f"  ⏭️ Keeping refreshed rating: {refreshed[row['tmdb_id']]}")
+            continue
         rating = fetch_lb_rating(title, year)
         
         if rating is None:
@@ -89,15 +105,20 @@ def main():
         time.sleep(0.5)
 
     # Merge recovered data back into main dataset
-    df_recovered_map = pd.DataFrame(recovered_ratings)
+    df_recovered_map = pd.DataFrame(recovered_ratings, columns=['tmdb_id', 'new_lb_rating', 'method'])
     df_final = df_clean.merge(df_recovered_map, on='tmdb_id', how='left')
     df_final['lb_rating'] = df_final['lb_rating'].combine_first(df_final['new_lb_rating'])
+    df_final['lb_rating'] = df_final['tmdb_id'].map(refreshed).combine_first(df_final['lb_rating'])
     
     df_final = df_final.drop(columns=['new_lb_rating', 'method'], errors='ignore')
     df_final.to_csv(OUTPUT_PATH, index=False)
+
+    # Track provenance and fetch time so the refresh scheduler can prioritize imputed ratings
+    attempts = df_recovered_map.assign(fetched=df_recovered_map['method'] == 'fetched', attempted_at=pd.Timestamp.now())
+    save_refresh_state(record_attempts(state, attempts))
     
     print(f"\n🎉 Recovery complete! Saved to {OUTPUT_PATH}")
-    print(f"Total rows updated: {len(df_audit)}")
+    print(f"Total rows updated: {len(df_audit)} ({len(refreshed)} refreshed ratings kept)")
 
 if __name__ == "__main__":
     main()
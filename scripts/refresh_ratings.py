@@ -0,0 +1,135 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from asian_cinema_collector import clean_slug, get_letterboxd_rating
+from recover_ratings import fetch_lb_rating
+
+
+# Initialize paths relative to script location
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+
+DATA_PATH = os.path.join(ROOT_DIR, 'data', 'asian_cinema_RECOVERED.csv')
+AUDIT_PATH = os.path.join(ROOT_DIR, 'data', 'missing_ratings_audit.csv')
+STATE_PATH = os.path.join(ROOT_DIR, 'data', 'lb_refresh_state.csv')
+
+STATE_COLUMNS = ['tmdb_id', 'last_fetched', 'last_attempted', 'method']
+
+# Scheduling knobs: a slug lookup is one page fetch; the year-matched search adds a search request
+REQUESTS_PER_RUN = 50
+SLUG_COST = 1
+SEARCH_COST = 2
+SEARCH_METHODS = ('median', 'fetched')    # slug failed for these; the search also matches year
+REFRESH_INTERVAL_DAYS = 90    # staleness of 1.0 after this long
+MAX_STALENESS = 3.0           # never-fetched films sit at the cap
+RECENCY_SCALE_YEARS = 10      # newer films' averages move more
+IMPUTED_WEIGHT = 2.0          # median-imputed ratings are worth replacing first
+
+
+def load_refresh_state(path=STATE_PATH):
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=STATE_COLUMNS)
+    return pd.read_csv(path, parse_dates=['last_fetched', 'last_attempted'])
+
+def save_refresh_state(state, path=STATE_PATH):
+    state[STATE_COLUMNS].sort_values('tmdb_id').to_csv(path, index=False)
+
+def record_attempts(state, attempts):
+    """Upsert attempt results (tmdb_id, fetched, method, attempted_at) into the state table."""
+    attempts = attempts.assign(
+        last_attempted=attempts['attempted_at'],
+        last_fetched=attempts['attempted_at'].where(attempts['fetched']),
+    ).set_index('tmdb_id')
+    state = state.set_index('tmdb_id')
+    new_ids = attempts.index.difference(state.index)
+    state = state.reindex(state.index.union(new_ids))
+
+    state.loc[attempts.index, 'last_attempted'] = attempts['last_attempted']
+    state.loc[attempts.index, 'method'] = attempts['method']
+    fetched = attempts[attempts['fetched']]
+    state.loc[fetched.index, 'last_fetched'] = fetched['last_fetched']
+    return state.reset_index().rename(columns={'index': 'tmdb_id'})
+
+def score_films(df, state, now, imputed_ids=()):
+    """Refresh priority per film: staleness gates a boost from recency, votes and imputation."""
+    films = df[['tmdb_id', 'title', 'year', 'vote_count', 'lb_rating']].merge(state, on='tmdb_id', how='left')
+
+    # Films without provenance were imputed if they appeared in the missing-ratings audit
+    unknown = films['method'].isnull()
+    films.loc[unknown, 'method'] = np.where(films.loc[unknown, 'tmdb_id'].isin(imputed_ids), 'median', 'collected')
+
+    last_touched = films[['last_fetched', 'last_attempted']].apply(pd.to_datetime).max(axis=1)
+    age_days = (now - last_touched).dt.days
+    films['staleness'] = (age_days / REFRESH_INTERVAL_DAYS).clip(upper=MAX_STALENESS).fillna(MAX_STALENESS)
+
+    recency = np.exp(-(now.year - films['year']).clip(lower=0) / RECENCY_SCALE_YEARS)
+    votes = np.log1p(films['vote_count'].fillna(0))
+    popularity = votes / votes.max() if votes.max() > 0 else votes
+    imputed = (films['method'] == 'median').astype(float)
+
+    films['priority'] = films['staleness'] * (1 + recency + popularity + IMPUTED_WEIGHT * imputed)
+    return films.sort_values('priority', ascending=False)
+
+def plan_refresh(df, state, now, budget=REQUESTS_PER_RUN, imputed_ids=()):
+    """Highest-priority films whose summed request cost fits the budget."""
+    scored = score_films(df, state, now, imputed_ids)
+    scored = scored[scored['priority'] > 0].copy()
+    scored['cost'] = np.where(scored['method'].isin(SEARCH_METHODS), SEARCH_COST, SLUG_COST)
+    return scored[scored['cost'].cumsum() <= budget]
+
+def refresh_rating(film):
+    """Re-fetch one film's rating, or None when Letterboxd has no match."""
+    if film.method in SEARCH_METHODS:
+        # Year-matched search: the title slug failed for these films or may belong to another film
+        return fetch_lb_rating(film.title, int(film.year))
+    rating = get_letterboxd_rating(clean_slug(film.title))
+    return None if rating == "None" else float(rating)
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the stalest, most valuable Letterboxd ratings within a request budget.")
+    parser.add_argument('--budget', type=int, default=REQUESTS_PER_RUN, help="Letterboxd requests to spend this run")
+    parser.add_argument('--dry-run', action='store_true', help="Print the plan without fetching")
+    args = parser.parse_args()
+
+    if not os.path.exists(DATA_PATH):
+        print(f"❌ Error: {DATA_PATH} not found.")
+        return
+
+    df = pd.read_csv(DATA_PATH)
+    state = load_refresh_state()
+    imputed_ids = pd.read_csv(AUDIT_PATH)['tmdb_id'] if os.path.exists(AUDIT_PATH) else ()
+    now = pd.Timestamp.now()
+
+    plan = plan_refresh(df, state, now, args.budget, imputed_ids)
+    print(f"--- 🔄 Refresh plan: {len(plan)} of {len(df)} films, {plan['cost'].sum()}/{args.budget} requests ---")
+    print(plan[['title', 'year', 'method', 'cost', 'staleness', 'priority']].head(10).to_string(index=False))
+    if args.dry_run or plan.empty:
+        return
+
+    attempts = []
+    for i, film in enumerate(plan.itertuples(), start=1):
+        rating = refresh_rating(film)
+        fetched = rating is not None
+        if fetched:
+            df.loc[df['tmdb_id'] == film.tmdb_id, 'lb_rating'] = rating
+            print(f"[{i}/{len(plan)}] ✅ {film.title}: {film.lb_rating} → {rating}")
+        else:
+            print(f"[{i}/{len(plan)}] ⚠️ {film.title}: no rating found")
+        attempts.append({
+            'tmdb_id': film.tmdb_id,
+            'fetched': fetched,
+            'method': 'fetched' if fetched and film.method in SEARCH_METHODS else film.method,
+            'attempted_at': pd.Timestamp.now(),
+        })
+        time.sleep(0.5)
+
+    df.to_csv(DATA_PATH, index=False)
+    save_refresh_state(record_attempts(state, pd.DataFrame(attempts)))
+    print(f"\n🎉 Refreshed {sum(a['fetched'] for a in attempts)}/{len(attempts)} ratings. State saved to {STATE_PATH}")
+
+if __name__ == "__main__":
+    main()